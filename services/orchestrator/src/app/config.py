@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+from typing import Callable, Mapping, Optional
+
+import yaml
+
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Where the Helm chart mounts the MCP config ConfigMap
+MOUNTED_MCP_CONFIG_PATH = Path("/config/mcp_config.yaml")
+# Fallback for running from a source checkout
+LOCAL_MCP_CONFIG_PATH = (
+    Path(__file__).parent.parent.parent.parent.parent / "mcp_config.yaml"
+)
+
+
+def get_mcp_config_path(
+    env: Optional[Mapping[str, str]] = None,
+    *,
+    exists: Callable[[Path], bool] = Path.exists,
+) -> Path:
+    """
+    Resolves the location of the MCP server configuration file.
+
+    Args:
+        env: The environment to read MCP_CONFIG_PATH from. Defaults to os.environ.
+        exists: Predicate used to check whether the mounted config file exists.
+
+    Returns:
+        The MCP_CONFIG_PATH override if set, otherwise the mounted config file,
+        falling back to mcp_config.yaml at the repository root.
+    """
+    env = env if env is not None else os.environ
+    override = env.get("MCP_CONFIG_PATH")
+    if override:
+        return Path(override)
+    if exists(MOUNTED_MCP_CONFIG_PATH):
+        return MOUNTED_MCP_CONFIG_PATH
+    return LOCAL_MCP_CONFIG_PATH
@@ -15,21 +15,19 @@ class CorrelationEngine:
         Returns:
             A tuple containing the suggested root cause and a confidence score.
         """
+        # Look the logs up once; the rules below only scan them for keywords
+        logs = evidence.get("logs", "")
+
         # Rule 1: OOMKilled
-        if (
-            "logs" in evidence
-            and "OOMKilled" in evidence["logs"]
-            and "restarts" in evidence
-            and evidence["restarts"] > 0
-        ):
+        if "OOMKilled" in logs and evidence.get("restarts", 0) > 0:
             return "Insufficient Memory", "high"
 
         # Rule 2: FailedScheduling
-        if "events" in evidence and "FailedScheduling" in evidence["events"]:
+        if "FailedScheduling" in evidence.get("events", ""):
             return "Insufficient Cluster Resources", "high"
 
         # Rule 3: Database Unreachable
-        if "logs" in evidence and "connection refused" in evidence["logs"]:
+        if "connection refused" in logs:
             # This rule is a bit more complex, as we need to check dependencies.
             # For the MVP, we'll just check for the log message.
             return "Database Unreachable", "medium"
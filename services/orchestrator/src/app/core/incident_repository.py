@@ -11,6 +11,10 @@ import re
 from ..services.knowledge_graph_service import KnowledgeGraphService
 from ..core.correlation_engine import CorrelationEngine
 
+# Fallback patterns for "pod:<name>" / "namespace:<name>" in a description
+POD_NAME_PATTERN = re.compile(r"pod:(\S+)")
+NAMESPACE_PATTERN = re.compile(r"namespace:(\S+)")
+
 
 class IncidentRepository:
     def __init__(self):
@@ -33,8 +37,8 @@ class IncidentRepository:
             namespace = extracted_entities.get("namespace", "default")
         else:
             # Fallback to regex if LLM extraction fails
-            pod_name_match = re.search(r"pod:(\S+)", description)
-            namespace_match = re.search(r"namespace:(\S+)", description)
+            pod_name_match = POD_NAME_PATTERN.search(description)
+            namespace_match = NAMESPACE_PATTERN.search(description)
 
             pod_name = pod_name_match.group(1) if pod_name_match else None
             namespace = (
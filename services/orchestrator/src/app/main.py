@@ -1,6 +1,7 @@
 import logging
 from fastapi import FastAPI
 from app.api.v1 import incidents
+from app.config import get_mcp_config_path
 from app.services.knowledge_graph_service import KnowledgeGraphService
 from app.services.mcp_config_service import MCPConfigService
 from app.services.mcp_connection_manager import MCPConnectionManager
@@ -34,15 +35,8 @@ async def startup_event():
         / "knowledge_graph.yaml"
     )
 
-    # TODO: Pass the mcp_server.yaml as a command line argument to the orchestrator instead of copying a file
-    config_path = Path("/config/mcp_config.yaml")
-    if not config_path.exists():
-        config_path = (
-            Path(__file__).parent.parent.parent.parent.parent / "mcp_config.yaml"
-        )
-
     try:
-        mcp_config_service = MCPConfigService(config_path=config_path)
+        mcp_config_service = MCPConfigService(config_path=get_mcp_config_path())
         mcp_config = mcp_config_service.load_config()
         app.state.mcp_connection_manager = MCPConnectionManager(mcp_config)
         await app.state.mcp_connection_manager.connect_to_servers()
@@ -1,6 +1,7 @@
 import yaml
 from pathlib import Path
 from typing import List
+from ..config import YAML_LOADER
 from ..models.knowledge_graph import KnowledgeGraph, Component
 
 
@@ -13,7 +14,7 @@ class KnowledgeGraphService:
 
     def _load_graph(self) -> tuple[KnowledgeGraph, dict[str, Component]]:
         with open(self.knowledge_graph_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YAML_LOADER)
             if data is None:
                 raise ValueError(
                     f"Knowledge graph file is empty: {self.knowledge_graph_path}"
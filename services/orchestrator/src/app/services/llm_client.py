@@ -1,9 +1,13 @@
+import functools
 import logging
 import os
 import json
 from typing import Optional, Dict, Any
 import google.generativeai as genai
 
+# Distinct incident descriptions whose extracted entities are kept in memory
+ENTITY_CACHE_SIZE = 128
+
 
 class LLMClient:
     def __init__(self):
@@ -13,8 +17,21 @@ class LLMClient:
         genai.configure(api_key=api_key)
         model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
         self.model = genai.GenerativeModel(model_name)
+        # Repeated alerts often carry the same description, so successful
+        # extractions are reused; failures raise and are therefore not cached
+        self._extract_entities_cached = functools.lru_cache(maxsize=ENTITY_CACHE_SIZE)(
+            self._request_entities
+        )
 
     def extract_entities(self, description: str) -> Optional[Dict[str, Any]]:
+        try:
+            # Copied so callers can't modify the cached entry
+            return dict(self._extract_entities_cached(description))
+        except Exception as e:
+            logging.error(f"Error extracting entities with LLM: {e}")
+            return None
+
+    def _request_entities(self, description: str) -> Dict[str, Any]:
         prompt = f"""You are an SRE assistant. Extract the pod name, namespace, and a summary of the error from the following incident description. Respond with a JSON object containing 'pod_name', 'namespace', and 'error_summary'. If a field cannot be extracted, use null. If the pod name is not explicitly mentioned, try to infer it from context. If the namespace is not explicitly mentioned, assume 'default'.
 
 Incident Description: {description}
@@ -26,25 +43,22 @@ Example JSON Response:
   "error_summary": "Container crashed due to OOM"
 }}
 """
-        try:
-            response = self.model.generate_content(prompt)
-            logging.info(f"LLM Response: {response.text}")
+        response = self.model.generate_content(prompt)
+        # response.text re-joins the candidate's parts on every access
+        response_text = response.text
+        logging.info(f"LLM Response: {response_text}")
 
-            # The LLM may wrap the JSON in a markdown block (```json ... ```).
-            # We need to extract the raw JSON string.
-            response_text = response.text
-            start_index = response_text.find("{")
-            end_index = response_text.rfind("}")
+        # The LLM may wrap the JSON in a markdown block (```json ... ```).
+        # We need to extract the raw JSON string.
+        start_index = response_text.find("{")
+        end_index = response_text.rfind("}")
 
-            if start_index == -1 or end_index == -1:
-                raise ValueError("Could not find a JSON object in the LLM response.")
+        if start_index == -1 or end_index == -1:
+            raise ValueError("Could not find a JSON object in the LLM response.")
 
-            json_string = response_text[start_index : end_index + 1]
-            extracted_data = json.loads(json_string)
-            return extracted_data
-        except Exception as e:
-            logging.error(f"Error extracting entities with LLM: {e}")
-            return None
+        json_string = response_text[start_index : end_index + 1]
+        extracted_data = json.loads(json_string)
+        return extracted_data
 
 
 llm_client_instance: Optional[LLMClient] = None
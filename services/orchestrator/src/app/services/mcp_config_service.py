@@ -1,3 +1,4 @@
+from app.config import YAML_LOADER
 from app.models.mcp_config import MCPConfig
 import yaml
 from pathlib import Path
@@ -16,10 +17,13 @@ class MCPConfigService:
             return MCPConfig(mcp_servers=[])
         try:
             with open(self._config_path, "r") as f:
-                config_data = yaml.safe_load(f)
+                config_data = yaml.load(f, Loader=YAML_LOADER)
                 if not config_data:
                     return MCPConfig(mcp_servers=[])
-                return MCPConfig(**config_data)
+                # model_validate rejects a non-mapping document with a
+                # ValidationError (reported as ValueError below) where
+                # MCPConfig(**data) would raise a bare TypeError.
+                return MCPConfig.model_validate(config_data)
         except (yaml.YAMLError, ValidationError) as e:
             raise ValueError(f"Error loading or validating MCP config: {e}") from e
         except IOError as e:
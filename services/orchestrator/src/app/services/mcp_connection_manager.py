@@ -1,7 +1,8 @@
-import asyncio
 import logging
+from asyncio import sleep
 from typing import Dict, Optional
 
+import httpx
 from mcp import ClientSession
 from mcp.client.streamable_http import create_mcp_http_client
 
@@ -9,6 +10,11 @@ from app.models.mcp_config import MCPConfig, MCPServerConfig
 
 logger = logging.getLogger(__name__)
 
+# Raised by httpx before connecting when the URL has no host or a port that
+# cannot be parsed, so every attempt would fail the same way. An out-of-range
+# port parses and fails at connect time, so it is retried.
+NON_RETRYABLE_ERRORS = (httpx.InvalidURL, httpx.UnsupportedProtocol)
+
 
 class MCPConnectionManager:
     """
@@ -58,13 +64,18 @@ class MCPConnectionManager:
                     f"Successfully connected to MCP server at URL: {server_config.server_url}"
                 )
                 return
+            except NON_RETRYABLE_ERRORS as e:
+                logger.error(
+                    f"Not retrying connection to MCP server at {server_config.server_url}: {e}"
+                )
+                return
             except Exception as e:
                 logger.warning(
                     f"Attempt {attempt + 1} to connect to MCP server at {server_config.server_url} failed: {e}"
                 )
                 logger.debug("Exception details:", exc_info=True)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(delay * (2**attempt))
+                    await sleep(delay * (2**attempt))
                 else:
                     logger.error(
                         f"Failed to connect to MCP server at {server_config.server_url} after {max_retries} attempts."
@@ -0,0 +1,80 @@
+import warnings
+
+import httpx
+import pytest
+import yaml
+
+from app.config import YAML_LOADER
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _llm_env():
+    """Gives the LLM client a fake API key for the whole session."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GEMINI_API_KEY", "mock_api_key")
+        yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _libyaml_check():
+    """Warns once per session when PyYAML falls back to the pure-Python loader."""
+    if YAML_LOADER is not getattr(yaml, "CSafeLoader", None):
+        warnings.warn(
+            "PyYAML was built without libyaml; YAML is parsed with SafeLoader",
+            stacklevel=1,
+        )
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    # Imported lazily so collecting modules that never use the app doesn't build it
+    from app.main import app as _app
+    from app.services.knowledge_graph_service import KnowledgeGraphService
+
+    # Installed by hand instead of running the startup handlers, which read the
+    # real knowledge graph and MCP config and connect to the MCP servers
+    knowledge_graph_path = tmp_path_factory.mktemp("app") / "knowledge_graph.yaml"
+    knowledge_graph_path.write_text("components: []\n")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            _app.state,
+            "knowledge_graph_service",
+            KnowledgeGraphService(knowledge_graph_path=knowledge_graph_path),
+            raising=False,
+        )
+        mp.setattr(_app.state, "mcp_connection_manager", None, raising=False)
+        yield _app
+
+
+@pytest.fixture(scope="session")
+def test_client(app):
+    """A TestClient shared by the whole session; it never enters the lifespan."""
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture
+async def async_client(app):
+    """
+    An httpx client that calls the app in-process on the test's event loop,
+    avoiding TestClient's thread hop.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def override_dependency(app):
+    """Sets app.dependency_overrides entries and removes them after the test."""
+    overridden = []
+
+    def _override(dependency, provider):
+        app.dependency_overrides[dependency] = provider
+        overridden.append(dependency)
+
+    yield _override
+    for dependency in overridden:
+        app.dependency_overrides.pop(dependency, None)
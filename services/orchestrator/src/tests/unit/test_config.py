@@ -0,0 +1,34 @@
+import pytest
+from pathlib import Path
+from app.config import (
+    LOCAL_MCP_CONFIG_PATH,
+    MOUNTED_MCP_CONFIG_PATH,
+    get_mcp_config_path,
+)
+
+CUSTOM_MCP_CONFIG_PATH = Path("/custom/mcp_config.yaml")
+
+
+@pytest.mark.parametrize(
+    "env, mounted_exists, expected_path",
+    [
+        pytest.param(
+            {"MCP_CONFIG_PATH": str(CUSTOM_MCP_CONFIG_PATH)},
+            True,
+            CUSTOM_MCP_CONFIG_PATH,
+            id="env_override",
+        ),
+        pytest.param({}, True, MOUNTED_MCP_CONFIG_PATH, id="mounted"),
+        pytest.param({}, False, LOCAL_MCP_CONFIG_PATH, id="default"),
+        pytest.param(
+            {"MCP_CONFIG_PATH": ""},
+            False,
+            LOCAL_MCP_CONFIG_PATH,
+            id="empty_override_ignored",
+        ),
+    ],
+)
+def test_get_mcp_config_path(env, mounted_exists, expected_path):
+    path = get_mcp_config_path(env, exists=lambda path: mounted_exists)
+
+    assert path == expected_path
@@ -3,43 +3,41 @@ from unittest.mock import MagicMock
 from app.core.correlation_engine import CorrelationEngine
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_knowledge_graph_service():
-    """Fixture for a mocked KnowledgeGraphService."""
+    """Fixture for a mocked KnowledgeGraphService; the rules never call it."""
     return MagicMock()
 
 
-def test_correlate_oomkilled(mock_knowledge_graph_service):
-    """Test the OOMKilled correlation rule."""
+@pytest.mark.parametrize(
+    "evidence, expected_root_cause, expected_confidence",
+    [
+        pytest.param(
+            {"logs": "OOMKilled", "restarts": 1},
+            "Insufficient Memory",
+            "high",
+            id="oomkilled",
+        ),
+        pytest.param(
+            {"events": "FailedScheduling"},
+            "Insufficient Cluster Resources",
+            "high",
+            id="failed_scheduling",
+        ),
+        pytest.param(
+            {"logs": "connection refused"},
+            "Database Unreachable",
+            "medium",
+            id="database_unreachable",
+        ),
+        pytest.param({"logs": "some other error"}, None, None, id="no_match"),
+    ],
+)
+def test_correlate(
+    mock_knowledge_graph_service, evidence, expected_root_cause, expected_confidence
+):
+    """Test each correlation rule, and that no root cause is suggested otherwise."""
     engine = CorrelationEngine(mock_knowledge_graph_service)
-    evidence = {"logs": "OOMKilled", "restarts": 1}
     root_cause, confidence = engine.correlate(evidence)
-    assert root_cause == "Insufficient Memory"
-    assert confidence == "high"
-
-
-def test_correlate_failed_scheduling(mock_knowledge_graph_service):
-    """Test the FailedScheduling correlation rule."""
-    engine = CorrelationEngine(mock_knowledge_graph_service)
-    evidence = {"events": "FailedScheduling"}
-    root_cause, confidence = engine.correlate(evidence)
-    assert root_cause == "Insufficient Cluster Resources"
-    assert confidence == "high"
-
-
-def test_correlate_database_unreachable(mock_knowledge_graph_service):
-    """Test the Database Unreachable correlation rule."""
-    engine = CorrelationEngine(mock_knowledge_graph_service)
-    evidence = {"logs": "connection refused"}
-    root_cause, confidence = engine.correlate(evidence)
-    assert root_cause == "Database Unreachable"
-    assert confidence == "medium"
-
-
-def test_correlate_no_match(mock_knowledge_graph_service):
-    """Test that no root cause is suggested when no rules match."""
-    engine = CorrelationEngine(mock_knowledge_graph_service)
-    evidence = {"logs": "some other error"}
-    root_cause, confidence = engine.correlate(evidence)
-    assert root_cause is None
-    assert confidence is None
+    assert root_cause == expected_root_cause
+    assert confidence == expected_confidence
@@ -0,0 +1,91 @@
+import pytest
+import uuid
+from unittest.mock import MagicMock
+from app.core.incident_repository import IncidentRepository
+from app.models.pod_details import PodDetails
+from app.services.k8s_agent_client import K8sAgentClient
+from app.services.knowledge_graph_service import KnowledgeGraphService
+from app.services.llm_client import LLMClient
+
+MOCK_POD_DETAILS = PodDetails(status="Running", restart_count=0, container_statuses=[])
+# Never stored: new incidents get random uuid4 ids
+ABSENT_INCIDENT_ID = uuid.UUID(int=0)
+POD_EVIDENCE = {"pod_details": MOCK_POD_DETAILS.model_dump(), "pod_logs": "mock logs"}
+
+
+@pytest.fixture
+def repo():
+    return IncidentRepository()
+
+
+@pytest.fixture
+def clients():
+    """One spec'd mock per collaborator, primed with default return values."""
+    llm_client = MagicMock(spec=LLMClient)
+    llm_client.extract_entities.return_value = None
+    k8s_agent_client = MagicMock(spec=K8sAgentClient)
+    k8s_agent_client.get_pod_details.return_value = MOCK_POD_DETAILS
+    k8s_agent_client.get_pod_logs.return_value = "mock logs"
+    return {
+        "llm_client": llm_client,
+        "k8s_agent_client": k8s_agent_client,
+        "knowledge_graph_service": MagicMock(spec=KnowledgeGraphService),
+    }
+
+
+@pytest.fixture
+def make_incident(repo, clients):
+    """Creates an incident in the test's repository using the default mocks."""
+
+    def _make_incident(description="Test incident"):
+        return repo.create(description=description, **clients)
+
+    return _make_incident
+
+
+@pytest.mark.parametrize(
+    "description, extracted_entities, expected_pod, expected_evidence",
+    [
+        pytest.param("Service is slow", None, None, {}, id="no_pod"),
+        pytest.param(
+            "test-pod is crashing",
+            {"pod_name": "test-pod", "namespace": "test-namespace"},
+            ("test-namespace", "test-pod"),
+            POD_EVIDENCE,
+            id="llm_entities",
+        ),
+        pytest.param(
+            "Crash in pod:test-pod",
+            None,
+            ("default", "test-pod"),
+            POD_EVIDENCE,
+            id="regex_fallback_default_namespace",
+        ),
+    ],
+)
+def test_create(
+    repo, clients, description, extracted_entities, expected_pod, expected_evidence
+):
+    clients["llm_client"].extract_entities.return_value = extracted_entities
+
+    incident = repo.create(description=description, **clients)
+
+    assert incident.status == "completed"
+    assert incident.completed_at is not None
+    assert incident.evidence == expected_evidence
+    get_pod_details = clients["k8s_agent_client"].get_pod_details
+    if expected_pod:
+        get_pod_details.assert_called_once_with(*expected_pod)
+    else:
+        get_pod_details.assert_not_called()
+
+
+def test_get_by_id_keeps_incidents_separate(repo, make_incident):
+    first, second = make_incident("First incident"), make_incident("Second incident")
+
+    assert repo.get_by_id(first.id) is first
+    assert repo.get_by_id(second.id) is second
+
+
+def test_get_by_id_not_found(repo):
+    assert repo.get_by_id(ABSENT_INCIDENT_ID) is None
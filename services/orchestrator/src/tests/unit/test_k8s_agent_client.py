@@ -1,114 +1,111 @@
 import httpx
 import pytest
-from unittest.mock import patch, MagicMock
 from app.services.k8s_agent_client import K8sAgentClient
 
+POD_LOGS = "log line 1\nlog line 2"
+CONTAINER_LOGS = "container log line 1\ncontainer log line 2"
+MOCK_POD_DETAILS_JSON = {
+    "status": "Running",
+    "restart_count": 0,
+    "container_statuses": [
+        {"name": "test-container", "state": "running", "ready": True}
+    ],
+    "resource_limits": {"cpu": "100m", "memory": "128Mi"},
+    "resource_requests": {"cpu": "50m", "memory": "64Mi"},
+}
+
+BASE_URL = "http://mock-k8s-agent"
+POD_URL = f"{BASE_URL}/api/v1/pods/test-namespace/test-pod"
+MISSING_POD_URL = f"{BASE_URL}/api/v1/pods/test-namespace/nonexistent-pod"
+
+# Canned agent replies keyed by the full request URL. Anything else gets a 500,
+# so a request to the wrong host, path or params fails the test.
+AGENT_ROUTES = {
+    POD_URL: (200, {"json": MOCK_POD_DETAILS_JSON}),
+    f"{POD_URL}/logs?tail=100": (200, {"text": POD_LOGS}),
+    f"{POD_URL}/logs?container=my-container&tail=50": (200, {"text": CONTAINER_LOGS}),
+    MISSING_POD_URL: (404, {}),
+    f"{MISSING_POD_URL}/logs?tail=100": (404, {}),
+}
+
+
+def _agent(request: httpx.Request) -> httpx.Response:
+    status_code, content = AGENT_ROUTES.get(str(request.url), (500, {}))
+    return httpx.Response(status_code, **content)
+
+
+@pytest.fixture(scope="module")
+def agent_transport():
+    return httpx.MockTransport(_agent)
+
+
+@pytest.fixture(scope="module")
+def k8s_agent_client(agent_transport):
+    """One client for the module, answered by _agent over a MockTransport."""
+    client = K8sAgentClient(base_url=BASE_URL)
+    client.client.close()
+    client.client = httpx.Client(transport=agent_transport)
+    yield client
+    client.client.close()
+
 
 @pytest.fixture
-def k8s_agent_client():
-    return K8sAgentClient(base_url="http://mock-k8s-agent")
-
-
-def test_get_pod_details_success(k8s_agent_client):
-    mock_response_json = {
-        "status": "Running",
-        "restart_count": 0,
-        "container_statuses": [
-            {"name": "test-container", "state": "running", "ready": True}
-        ],
-        "resource_limits": {"cpu": "100m", "memory": "128Mi"},
-        "resource_requests": {"cpu": "50m", "memory": "64Mi"},
-    }
-    with patch.object(k8s_agent_client.client, "get") as mock_get:
-        mock_response = MagicMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_response_json
-        mock_response.raise_for_status.return_value = None  # No error
-        mock_get.return_value = mock_response
-
-        pod_details = k8s_agent_client.get_pod_details("test-namespace", "test-pod")
-
-        assert pod_details is not None
-        assert pod_details.status == "Running"
-        assert pod_details.restart_count == 0
-        assert len(pod_details.container_statuses) == 1
-        assert pod_details.container_statuses[0].name == "test-container"
-        assert pod_details.resource_limits.cpu == "100m"
-        mock_get.assert_called_once_with(
-            "http://mock-k8s-agent/api/v1/pods/test-namespace/test-pod"
-        )
-
-
-def test_get_pod_details_not_found(k8s_agent_client):
-    with patch.object(k8s_agent_client.client, "get") as mock_get:
-        mock_response = MagicMock(spec=httpx.Response)
-        mock_response.status_code = 404
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Not Found", request=httpx.Request("GET", "url"), response=mock_response
-        )
-        mock_get.return_value = mock_response
-
-        pod_details = k8s_agent_client.get_pod_details(
-            "test-namespace", "nonexistent-pod"
-        )
-
-        assert pod_details is None
-        mock_get.assert_called_once_with(
-            "http://mock-k8s-agent/api/v1/pods/test-namespace/nonexistent-pod"
-        )
-
-
-def test_get_pod_logs_success(k8s_agent_client):
-    mock_logs = "log line 1\nlog line 2"
-    with patch.object(k8s_agent_client.client, "get") as mock_get:
-        mock_response = MagicMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.text = mock_logs
-        mock_response.raise_for_status.return_value = None  # No error
-        mock_get.return_value = mock_response
-
-        logs = k8s_agent_client.get_pod_logs("test-namespace", "test-pod")
-
-        assert logs == mock_logs
-        mock_get.assert_called_once_with(
-            "http://mock-k8s-agent/api/v1/pods/test-namespace/test-pod/logs",
-            params={"tail": 100},
-        )
-
-
-def test_get_pod_logs_with_params_success(k8s_agent_client):
-    mock_logs = "container log line 1\ncontainer log line 2"
-    with patch.object(k8s_agent_client.client, "get") as mock_get:
-        mock_response = MagicMock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.text = mock_logs
-        mock_response.raise_for_status.return_value = None  # No error
-        mock_get.return_value = mock_response
-
-        logs = k8s_agent_client.get_pod_logs(
-            "test-namespace", "test-pod", container="my-container", tail=50
-        )
-
-        assert logs == mock_logs
-        mock_get.assert_called_once_with(
-            "http://mock-k8s-agent/api/v1/pods/test-namespace/test-pod/logs",
-            params={"container": "my-container", "tail": 50},
-        )
-
-
-def test_get_pod_logs_not_found(k8s_agent_client):
-    with patch.object(k8s_agent_client.client, "get") as mock_get:
-        mock_response = MagicMock(spec=httpx.Response)
-        mock_response.status_code = 404
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Not Found", request=httpx.Request("GET", "url"), response=mock_response
-        )
-        mock_get.return_value = mock_response
-
-        logs = k8s_agent_client.get_pod_logs("test-namespace", "nonexistent-pod")
-
-        assert logs is None
-        mock_get.assert_called_once_with(
-            "http://mock-k8s-agent/api/v1/pods/test-namespace/nonexistent-pod/logs",
-            params={"tail": 100},
-        )
+def agent_urls(agent_transport, monkeypatch):
+    """The URLs the agent is sent during the test, in order."""
+    urls = []
+
+    def _record(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        return _agent(request)
+
+    monkeypatch.setattr(agent_transport, "handler", _record)
+    return urls
+
+
+def test_get_pod_details_success(k8s_agent_client, agent_urls):
+    pod_details = k8s_agent_client.get_pod_details("test-namespace", "test-pod")
+
+    assert pod_details is not None
+    assert pod_details.status == "Running"
+    assert pod_details.restart_count == 0
+    assert len(pod_details.container_statuses) == 1
+    assert pod_details.container_statuses[0].name == "test-container"
+    assert pod_details.resource_limits.cpu == "100m"
+    assert agent_urls == [POD_URL]
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected_logs, expected_url",
+    [
+        pytest.param({}, POD_LOGS, f"{POD_URL}/logs?tail=100", id="defaults"),
+        pytest.param(
+            {"container": "my-container", "tail": 50},
+            CONTAINER_LOGS,
+            f"{POD_URL}/logs?container=my-container&tail=50",
+            id="container_and_tail",
+        ),
+    ],
+)
+def test_get_pod_logs_success(
+    k8s_agent_client, agent_urls, kwargs, expected_logs, expected_url
+):
+    logs = k8s_agent_client.get_pod_logs("test-namespace", "test-pod", **kwargs)
+
+    assert logs == expected_logs
+    assert agent_urls == [expected_url]
+
+
+@pytest.mark.parametrize(
+    "method_name, expected_url",
+    [
+        ("get_pod_details", MISSING_POD_URL),
+        ("get_pod_logs", f"{MISSING_POD_URL}/logs?tail=100"),
+    ],
+)
+def test_not_found_returns_none(
+    k8s_agent_client, agent_urls, method_name, expected_url
+):
+    result = getattr(k8s_agent_client, method_name)("test-namespace", "nonexistent-pod")
+
+    assert result is None
+    assert agent_urls == [expected_url]
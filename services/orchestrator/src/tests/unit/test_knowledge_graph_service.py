@@ -1,12 +1,10 @@
 import pytest
+import yaml
 from app.services.knowledge_graph_service import KnowledgeGraphService
 from app.models.knowledge_graph import KnowledgeGraph
 
-
-# Create a temporary knowledge_graph.yaml for testing
-@pytest.fixture
-def temp_knowledge_graph_file(tmp_path):
-    content = """
+# Kept as bytes so fixtures write them out without re-encoding
+KNOWLEDGE_GRAPH_YAML = b"""
 components:
   - name: orchestrator-service
     type: service
@@ -19,12 +17,39 @@ components:
     relationships:
       - depends_on: orchestrator-service
 """
-    file_path = tmp_path / "knowledge_graph.yaml"
-    file_path.write_text(content)
-    return file_path
+
+# A larger graph for the lookup test, serialized once at import
+LARGE_GRAPH_SIZE = 100
+LARGE_KNOWLEDGE_GRAPH_YAML = (
+    "components:\n"
+    + "".join(
+        f"  - name: component-{i}\n    type: service\n" for i in range(LARGE_GRAPH_SIZE)
+    )
+).encode()
+
+
+@pytest.fixture(scope="module")
+def graph_dir(tmp_path_factory):
+    """One directory for the module's graph files, instead of one per test."""
+    return tmp_path_factory.mktemp("knowledge_graph")
 
 
 @pytest.fixture
+def graph_file(graph_dir, request):
+    """A graph file path unique to the requesting test."""
+    return graph_dir / f"{request.node.name}.yaml"
+
+
+# Create a temporary knowledge_graph.yaml for testing, once per module
+@pytest.fixture(scope="module")
+def temp_knowledge_graph_file(graph_dir):
+    file_path = graph_dir / "knowledge_graph.yaml"
+    file_path.write_bytes(KNOWLEDGE_GRAPH_YAML)
+    return file_path
+
+
+# Shared by the tests below, which only read from the service
+@pytest.fixture(scope="module")
 def knowledge_graph_service(temp_knowledge_graph_file):
     return KnowledgeGraphService(knowledge_graph_path=temp_knowledge_graph_file)
 
@@ -37,8 +62,7 @@ def test_load_graph_success(knowledge_graph_service):
     assert orchestrator is not None
     assert orchestrator.name == "orchestrator-service"
     assert orchestrator.type == "service"
-    assert len(orchestrator.relationships) == 1
-    assert orchestrator.relationships[0].depends_on == "k8s-agent"
+    assert [r.depends_on for r in orchestrator.relationships] == ["k8s-agent"]
 
     k8s_agent = knowledge_graph_service.get_component("k8s-agent")
     assert k8s_agent is not None
@@ -50,8 +74,7 @@ def test_load_graph_success(knowledge_graph_service):
     assert database is not None
     assert database.name == "database"
     assert database.type == "datastore"
-    assert len(database.relationships) == 1
-    assert database.relationships[0].depends_on == "orchestrator-service"
+    assert [r.depends_on for r in database.relationships] == ["orchestrator-service"]
 
 
 def test_get_dependencies(knowledge_graph_service):
@@ -74,3 +97,31 @@ def test_get_component(knowledge_graph_service):
 
     component = knowledge_graph_service.get_component("non-existent-component")
     assert component is None
+
+
+def test_component_map_covers_large_graph(graph_file):
+    graph_file.write_bytes(LARGE_KNOWLEDGE_GRAPH_YAML)
+    service = KnowledgeGraphService(knowledge_graph_path=graph_file)
+
+    assert len(service._component_map) == LARGE_GRAPH_SIZE
+    last = f"component-{LARGE_GRAPH_SIZE - 1}"
+    assert service.get_component(last).name == last
+
+
+@pytest.mark.parametrize(
+    "content, expected_exception, match",
+    [
+        pytest.param(None, FileNotFoundError, None, id="missing_file"),
+        pytest.param(b"", ValueError, "is empty", id="empty_file"),
+        pytest.param(b"components: [", yaml.YAMLError, None, id="invalid_yaml"),
+        pytest.param(
+            b"- name: k8s-agent", TypeError, "not a valid mapping", id="non_mapping"
+        ),
+    ],
+)
+def test_load_graph_errors(graph_file, content, expected_exception, match):
+    if content is not None:
+        graph_file.write_bytes(content)
+
+    with pytest.raises(expected_exception, match=match):
+        KnowledgeGraphService(knowledge_graph_path=graph_file)
@@ -1,84 +1,101 @@
 import pytest
-from unittest.mock import patch, MagicMock
-import os
+from unittest.mock import patch
+from types import SimpleNamespace
 import json
 from app.services.llm_client import LLMClient
 
+INCIDENT_DESCRIPTION = (
+    "Incident: Pod test-pod-123 in namespace test-ns is in a restart loop."
+)
+EXTRACTED_ENTITIES = {
+    "pod_name": "test-pod-123",
+    "namespace": "test-ns",
+    "error_summary": "Container restart loop",
+}
+# The response from the LLM can come back in json escaped in Markdown format
+MARKDOWN_ENTITIES_RESPONSE = SimpleNamespace(
+    text=f"```json {json.dumps(EXTRACTED_ENTITIES)}```"
+)
+
+
+@pytest.fixture(scope="module")
+def _shared_llm_client():
+    """Built once per module; generate_content is patched on the model class."""
+    return LLMClient()
+
 
 @pytest.fixture
-def llm_client():
-    # Temporarily set the environment variable for the test
-    os.environ["GEMINI_API_KEY"] = "mock_api_key"
-    client = LLMClient()
-    del os.environ["GEMINI_API_KEY"]
-    return client
+def llm_client(_shared_llm_client):
+    """The shared client; its _extract_entities_cached cache is cleared after
+    each test so cached extractions never leak between tests."""
+    yield _shared_llm_client
+    _shared_llm_client._extract_entities_cached.cache_clear()
 
 
-def test_llm_client_initialization_no_api_key():
-    if "GEMINI_API_KEY" in os.environ:
-        del os.environ["GEMINI_API_KEY"]
+@pytest.fixture
+def mock_generate_content():
+    """Patches the Gemini model call; tests set its return value or side effect."""
+    with patch("google.generativeai.GenerativeModel.generate_content") as mock:
+        yield mock
+
+
+def test_llm_client_initialization_no_api_key(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
     with pytest.raises(
         ValueError, match="GEMINI_API_KEY environment variable not set."
     ):
         LLMClient()
 
 
-def test_extract_entities_success(llm_client):
-    mock_llm_response_text = json.dumps(
-        {
-            "pod_name": "test-pod-123",
-            "namespace": "test-ns",
-            "error_summary": "Container restart loop",
-        }
-    )
-    mock_llm_response = MagicMock()
-    # The response from the LLM can come back in json escaped in Markdown format
-    mock_llm_response.text = f"```json {mock_llm_response_text}```"
-
-    with patch(
-        "google.generativeai.GenerativeModel.generate_content",
-        return_value=mock_llm_response,
-    ) as mock_generate_content:
-        description = (
-            "Incident: Pod test-pod-123 in namespace test-ns is in a restart loop."
-        )
-        extracted_data = llm_client.extract_entities(description)
-
-        assert extracted_data == {
-            "pod_name": "test-pod-123",
-            "namespace": "test-ns",
-            "error_summary": "Container restart loop",
-        }
-        mock_generate_content.assert_called_once()
-        args, kwargs = mock_generate_content.call_args
-        assert "Incident Description:" in args[0]
-        assert "test-pod-123" in args[0]
-
-
-def test_extract_entities_llm_returns_invalid_json(llm_client):
-    mock_llm_response = MagicMock()
-    mock_llm_response.text = "invalid json response"
-
-    with patch(
-        "google.generativeai.GenerativeModel.generate_content",
-        return_value=mock_llm_response,
-    ):
-        description = (
-            "Incident: Pod test-pod-123 in namespace test-ns is in a restart loop."
-        )
-        extracted_data = llm_client.extract_entities(description)
+def test_extract_entities_success(llm_client, mock_generate_content):
+    mock_generate_content.return_value = MARKDOWN_ENTITIES_RESPONSE
 
-        assert extracted_data is None
+    extracted_data = llm_client.extract_entities(INCIDENT_DESCRIPTION)
 
+    assert extracted_data == EXTRACTED_ENTITIES
+    mock_generate_content.assert_called_once()
+    args, kwargs = mock_generate_content.call_args
+    assert "Incident Description:" in args[0]
+    assert "test-pod-123" in args[0]
 
-def test_extract_entities_llm_api_error(llm_client):
-    with patch(
-        "google.generativeai.GenerativeModel.generate_content",
-        side_effect=Exception("API Error"),
-    ):
-        description = (
-            "Incident: Pod test-pod-123 in namespace test-ns is in a restart loop."
-        )
-        extracted_data = llm_client.extract_entities(description)
 
-        assert extracted_data is None
+def test_extract_entities_reuses_cached_result(llm_client, mock_generate_content):
+    mock_generate_content.return_value = MARKDOWN_ENTITIES_RESPONSE
+
+    first = llm_client.extract_entities(INCIDENT_DESCRIPTION)
+    first["pod_name"] = "modified-by-caller"
+    second = llm_client.extract_entities(INCIDENT_DESCRIPTION)
+
+    assert second == EXTRACTED_ENTITIES
+    mock_generate_content.assert_called_once()
+
+
+def test_extract_entities_does_not_cache_failures(llm_client, mock_generate_content):
+    mock_generate_content.side_effect = [
+        Exception("API Error"),
+        MARKDOWN_ENTITIES_RESPONSE,
+    ]
+
+    assert llm_client.extract_entities(INCIDENT_DESCRIPTION) is None
+    assert llm_client.extract_entities(INCIDENT_DESCRIPTION) == EXTRACTED_ENTITIES
+
+
+@pytest.mark.parametrize(
+    "response, error",
+    [
+        pytest.param(
+            SimpleNamespace(text="invalid json response"), None, id="no_json_object"
+        ),
+        pytest.param(SimpleNamespace(text="{not json}"), None, id="malformed_json"),
+        pytest.param(None, Exception("API Error"), id="api_error"),
+    ],
+)
+def test_extract_entities_failure_returns_none(
+    llm_client, mock_generate_content, response, error
+):
+    mock_generate_content.return_value = response
+    mock_generate_content.side_effect = error
+
+    extracted_data = llm_client.extract_entities(INCIDENT_DESCRIPTION)
+
+    assert extracted_data is None
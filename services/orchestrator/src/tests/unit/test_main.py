@@ -1,15 +1,9 @@
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-client = TestClient(app)
-
-
-def test_read_health():
+async def test_read_health(async_client):
     """
     Tests the /health endpoint.
     """
-    response = client.get("/health")
+    response = await async_client.get("/health")
     assert response.status_code == 200
-    assert response.json()["status"] == "ok"
-    assert "mcp_connections" in response.json()
+    data = response.json()
+    assert data["status"] == "ok"
+    assert "mcp_connections" in data
@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import patch, mock_open
+import re
+from unittest.mock import patch
 from pathlib import Path
 
 from app.services.mcp_config_service import MCPConfigService
@@ -21,63 +22,68 @@ mcp_servers:
 
 MALFORMED_YAML = "mcp_servers: [ server_url: 'bad'"
 
+NON_MAPPING_YAML = """
+- server_url: "https://test.com"
+  transport_type: "https"
+"""
+
+# Compiled once and shared by the pytest.raises checks below
+LOAD_ERROR_MATCH = re.compile("Error loading or validating MCP config")
+IO_ERROR_MATCH = re.compile("Could not read MCP config file")
+
+CONFIG_FILE_CONTENTS = {
+    "valid": VALID_YAML,
+    "empty": "",
+    "invalid_schema": INVALID_SCHEMA_YAML,
+    "malformed": MALFORMED_YAML,
+    "non_mapping": NON_MAPPING_YAML,
+}
+
+
+@pytest.fixture(scope="module")
+def config_files(tmp_path_factory) -> dict[str, Path]:
+    """Writes each config above to disk once, keyed like CONFIG_FILE_CONTENTS."""
+    config_dir = tmp_path_factory.mktemp("mcp_config")
+    paths = {}
+    for name, content in CONFIG_FILE_CONTENTS.items():
+        paths[name] = config_dir / f"{name}.yaml"
+        paths[name].write_text(content)
+    return paths
+
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_path() -> Path:
     return Path("/fake/path/mcp_config.yaml")
 
 
-def test_load_valid_config(mock_path):
-    with patch("builtins.open", mock_open(read_data=VALID_YAML)) as mock_file:
-        with patch("pathlib.Path.is_file", return_value=True):
-            service = MCPConfigService(mock_path)
-            config = service.load_config()
-            assert config is not None
-            assert len(config.mcp_servers) == 1
-            assert config.mcp_servers[0].server_url == "https://test.com"
-            mock_file.assert_called_once_with(mock_path, "r")
+def test_load_valid_config(config_files):
+    service = MCPConfigService(config_files["valid"])
+    config = service.load_config()
+    assert len(config.mcp_servers) == 1
+    assert config.mcp_servers[0].server_url == "https://test.com"
 
 
 def test_missing_config_file(mock_path):
-    with patch("pathlib.Path.is_file", return_value=False):
-        service = MCPConfigService(mock_path)
-        config = service.load_config()
-        assert config is not None
-        assert len(config.mcp_servers) == 0
-
-
-def test_empty_config_file(mock_path):
-    with patch("builtins.open", mock_open(read_data="")):
-        with patch("pathlib.Path.is_file", return_value=True):
-            service = MCPConfigService(mock_path)
-            config = service.load_config()
-            assert config is not None
-            assert len(config.mcp_servers) == 0
-
-
-def test_invalid_schema(mock_path):
-    with patch("builtins.open", mock_open(read_data=INVALID_SCHEMA_YAML)):
-        with patch("pathlib.Path.is_file", return_value=True):
-            with pytest.raises(
-                ValueError, match="Error loading or validating MCP config"
-            ):
-                service = MCPConfigService(mock_path)
-                service.load_config()
-
-
-def test_malformed_yaml(mock_path):
-    with patch("builtins.open", mock_open(read_data=MALFORMED_YAML)):
-        with patch("pathlib.Path.is_file", return_value=True):
-            with pytest.raises(
-                ValueError, match="Error loading or validating MCP config"
-            ):
-                service = MCPConfigService(mock_path)
-                service.load_config()
-
-
-def test_io_error(mock_path):
+    service = MCPConfigService(mock_path)
+    config = service.load_config()
+    assert len(config.mcp_servers) == 0
+
+
+def test_empty_config_file(config_files):
+    service = MCPConfigService(config_files["empty"])
+    config = service.load_config()
+    assert len(config.mcp_servers) == 0
+
+
+@pytest.mark.parametrize("config_name", ["invalid_schema", "malformed", "non_mapping"])
+def test_invalid_config(config_files, config_name):
+    with pytest.raises(ValueError, match=LOAD_ERROR_MATCH):
+        service = MCPConfigService(config_files[config_name])
+        service.load_config()
+
+
+def test_io_error(config_files):
     with patch("builtins.open", side_effect=IOError("File not readable")):
-        with patch("pathlib.Path.is_file", return_value=True):
-            with pytest.raises(IOError, match="Could not read MCP config file"):
-                service = MCPConfigService(mock_path)
-                service.load_config()
+        with pytest.raises(IOError, match=IO_ERROR_MATCH):
+            service = MCPConfigService(config_files["valid"])
+            service.load_config()
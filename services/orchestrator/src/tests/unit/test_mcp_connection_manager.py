@@ -1,11 +1,16 @@
+import asyncio
+import contextlib
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from app.models.mcp_config import MCPConfig, MCPServerConfig
 from app.services.mcp_connection_manager import MCPConnectionManager
 
+# Share one event loop across the module instead of creating one per test
+pytestmark = pytest.mark.asyncio(scope="module")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def mcp_config():
     return MCPConfig(
         mcp_servers=[
@@ -17,72 +22,145 @@ def mcp_config():
     )
 
 
-@pytest.mark.asyncio
-async def test_connect_to_servers_success(mcp_config):
-    # Create a mock for the client instance
-    mock_client_instance = AsyncMock()
-    mock_client_instance.post.return_value.status_code = 200
+@pytest.fixture
+def mock_client_instance():
+    """Mocked MCP HTTP client whose tools/list request succeeds."""
+    client_instance = AsyncMock()
+    client_instance.post.return_value.status_code = 200
+    return client_instance
+
 
-    # Create an async context manager mock
+@pytest.fixture
+def mock_create_client(mock_client_instance):
+    """Patches create_mcp_http_client to yield mock_client_instance."""
     async_context_manager_mock = AsyncMock()
     async_context_manager_mock.__aenter__.return_value = mock_client_instance
-
     with patch(
         "app.services.mcp_connection_manager.create_mcp_http_client",
         return_value=async_context_manager_mock,
-    ) as mock_create_client:
-        manager = MCPConnectionManager(mcp_config)
-        await manager.connect_to_servers()
+    ) as mock_create:
+        yield mock_create
 
-        # Assert that the http client creator was called
-        mock_create_client.assert_called_once()
-
-        # Assert that the post method was called on the client instance
-        mock_client_instance.post.assert_called_once_with(
-            "http://localhost:8080/mcp",
-            json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json,text/event-stream",
-            },
-        )
-
-        # Check if the client was added to the manager
-        assert "localhost:8080/mcp" in manager._clients
 
+@pytest.fixture
+def mock_sleep():
+    """
+    Replaces the connection manager's own sleep binding, so only the retry
+    backoff stops waiting; asyncio.sleep is untouched for everything else.
+    """
+    with patch(
+        "app.services.mcp_connection_manager.sleep", new_callable=AsyncMock
+    ) as mock:
+        yield mock
+
+
+async def test_connect_to_servers_success(
+    mcp_config, mock_create_client, mock_client_instance
+):
+    manager = MCPConnectionManager(mcp_config)
+    await manager.connect_to_servers()
+
+    # Assert that the http client creator was called
+    mock_create_client.assert_called_once()
+
+    # Assert that the post method was called on the client instance
+    mock_client_instance.post.assert_called_once_with(
+        "http://localhost:8080/mcp",
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json,text/event-stream",
+        },
+    )
 
-@pytest.mark.asyncio
-async def test_connect_to_servers_failure(mcp_config):
+    # Check if the client was added to the manager
+    assert "localhost:8080/mcp" in manager._clients
+
+
+@pytest.mark.parametrize(
+    "failures, connected, expected_sleeps",
+    [
+        pytest.param(1, True, [5], id="second_attempt"),
+        pytest.param(2, True, [5, 10], id="last_attempt"),
+        pytest.param(3, False, [5, 10], id="all_attempts_fail"),
+    ],
+)
+async def test_connect_to_servers_retries(
+    mcp_config,
+    mock_create_client,
+    mock_client_instance,
+    mock_sleep,
+    failures,
+    connected,
+    expected_sleeps,
+):
+    success = mock_client_instance.post.return_value
+    errors = [Exception("Connection failed")] * failures
+    mock_client_instance.post.side_effect = errors + [success]
+
+    manager = MCPConnectionManager(mcp_config)
+    await manager.connect_to_servers()
+
+    assert ("localhost:8080/mcp" in manager._clients) == connected
+    assert mock_client_instance.post.call_count == min(failures + 1, 3)
+    # Exponential backoff between attempts
+    assert [call.args[0] for call in mock_sleep.await_args_list] == expected_sleeps
+
+
+async def test_retry_backoff_does_not_block_event_loop(mcp_config):
+    """Other tasks must keep running while a connection attempt backs off."""
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    server_config = mcp_config.mcp_servers[0]
+    manager = MCPConnectionManager(mcp_config)
     with patch(
         "app.services.mcp_connection_manager.create_mcp_http_client",
-        new_callable=AsyncMock,
-    ) as mock_create_client:
-        mock_create_client.side_effect = Exception("Connection failed")
-
-        manager = MCPConnectionManager(mcp_config)
-        await manager.connect_to_servers()
+        side_effect=Exception("Connection failed"),
+    ):
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            # A blocking sleep would never yield, so the ticker would never start
+            await manager._connect_with_retry(
+                server_config.server_url, server_config, max_retries=2, delay=0.01
+            )
+        finally:
+            ticker_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await ticker_task
+
+    assert ticks
+
+
+@pytest.mark.parametrize(
+    "server_url",
+    [
+        pytest.param("/mcp", id="missing_host"),
+        pytest.param("localhost:abc/mcp", id="unparseable_port"),
+    ],
+)
+async def test_connect_to_servers_does_not_retry_invalid_url(server_url, mock_sleep):
+    # No client patch: httpx itself rejects these URLs before connecting
+    mcp_config = MCPConfig(
+        mcp_servers=[MCPServerConfig(server_url=server_url, transport_type="http")]
+    )
 
-        assert "localhost:8080/mcp" not in manager._clients
-        assert mock_create_client.call_count == 3
+    manager = MCPConnectionManager(mcp_config)
+    await manager.connect_to_servers()
 
+    assert server_url not in manager._clients
+    mock_sleep.assert_not_awaited()
 
-@pytest.mark.asyncio
-async def test_disconnect_from_servers(mcp_config):
-    # Create a mock for the client instance
-    mock_client_instance = AsyncMock()
-    mock_client_instance.post.return_value.status_code = 200
-    mock_client_instance.close = AsyncMock()
 
-    # Create an async context manager mock
-    async_context_manager_mock = AsyncMock()
-    async_context_manager_mock.__aenter__.return_value = mock_client_instance
-
-    with patch(
-        "app.services.mcp_connection_manager.create_mcp_http_client",
-        return_value=async_context_manager_mock,
-    ):
-        manager = MCPConnectionManager(mcp_config)
-        await manager.connect_to_servers()
-        await manager.disconnect_from_servers()
+async def test_disconnect_from_servers(
+    mcp_config, mock_create_client, mock_client_instance
+):
+    manager = MCPConnectionManager(mcp_config)
+    await manager.connect_to_servers()
+    await manager.disconnect_from_servers()
 
-        mock_client_instance.close.assert_called_once()
+    mock_client_instance.close.assert_called_once()